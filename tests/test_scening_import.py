@@ -0,0 +1,49 @@
+from __future__ import annotations
+
+from pathlib import Path
+
+import pytest
+
+from vspreview.core import Frame
+from vspreview.models import scening
+from vspreview.models.scening import SceningList
+from vspreview.toolbars.scening.import_files import _in_any_interval, _merge_intervals, import_generic
+
+
+@pytest.fixture(autouse=True)
+def no_main_window(monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setattr(scening, 'main_window', lambda: None)
+
+
+def test_merge_intervals() -> None:
+    assert _merge_intervals([]) == ([], [])
+    assert _merge_intervals([(10, 20), (0, 5), (15, 30), (6, 8), (40, 40)]) == ([0, 10, 40], [8, 30, 40])
+    assert _merge_intervals([(0, 100), (10, 20)]) == ([0], [100])
+
+
+def test_in_any_interval() -> None:
+    starts, ends = _merge_intervals([(10, 20), (30, 40)])
+
+    assert [value for value in range(0, 50) if _in_any_interval(value, starts, ends)] == [
+        *range(10, 21), *range(30, 41)
+    ]
+
+
+def test_import_generic(tmp_path: Path) -> None:
+    path = tmp_path / 'mappings.txt'
+    path.write_bytes(b'10 20\r\n  30\t40 50\n\n   \n60\nfoo bar\n70 80 baz\n90 95')
+
+    scening_list = SceningList('test', Frame(1000))
+
+    assert import_generic(path, scening_list) == 3
+    assert [(int(scene.start), int(scene.end)) for scene in scening_list] == [(10, 20), (30, 40), (90, 95)]
+
+
+def test_import_generic_empty_file(tmp_path: Path) -> None:
+    path = tmp_path / 'mappings.txt'
+    path.write_bytes(b'')
+
+    scening_list = SceningList('test', Frame(1000))
+
+    assert import_generic(path, scening_list) == 0
+    assert len(scening_list) == 0
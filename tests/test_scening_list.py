@@ -0,0 +1,111 @@
+from __future__ import annotations
+
+from typing import Any
+
+import pytest
+
+from vspreview.core import Frame, Scene
+from vspreview.models import scening
+from vspreview.models.scening import SceningList
+
+
+@pytest.fixture(autouse=True)
+def no_main_window(monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setattr(scening, 'main_window', lambda: None)
+
+
+def make_list(*bounds: tuple[int, int], max_value: int = 1000) -> SceningList:
+    return SceningList('test', Frame(max_value), [Scene(Frame(start), Frame(end)) for start, end in bounds])
+
+
+def get_bounds(scening_list: SceningList) -> list[tuple[int, int]]:
+    return [(int(scene.start), int(scene.end)) for scene in scening_list]
+
+
+def record_events(scening_list: SceningList) -> list[tuple[Any, ...]]:
+    events = list[tuple[Any, ...]]()
+
+    scening_list.rowsInserted.connect(lambda parent, first, last: events.append(('insert', first, last)))
+    scening_list.modelReset.connect(lambda: events.append(('reset', )))
+
+    return events
+
+
+def test_add_many_dedups_and_counts_out_of_range() -> None:
+    scening_list = make_list((10, 20), max_value=100)
+
+    dropped = scening_list.add_many([
+        (Frame(10), Frame(20), 'already in the list'),
+        (Frame(30), Frame(40), ''),
+        (Frame(40), Frame(30), 'same scene once normalized'),
+        (Frame(50), None, ''),
+        (Frame(90), Frame(101), ''),
+        (Frame(200), None, ''),
+    ])
+
+    assert dropped == 2
+    assert get_bounds(scening_list) == [(10, 20), (30, 40), (50, 50)]
+
+
+def test_add_many_appends_after_last_scene() -> None:
+    scening_list = make_list((0, 5))
+    events = record_events(scening_list)
+
+    scening_list.add_many([(Frame(20), None, ''), (Frame(10), Frame(15), '')])
+
+    assert events == [('insert', 1, 2)]
+    assert get_bounds(scening_list) == [(0, 5), (10, 15), (20, 20)]
+
+
+def test_add_many_merges_earlier_scenes_with_reset() -> None:
+    scening_list = make_list((10, 20), (40, 50))
+    events = record_events(scening_list)
+
+    scening_list.add_many([(Frame(60), None, ''), (Frame(0), Frame(5), ''), (Frame(30), None, '')])
+
+    assert events == [('reset', )]
+    assert get_bounds(scening_list) == [(0, 5), (10, 20), (30, 30), (40, 50), (60, 60)]
+
+
+def test_add_many_without_new_scenes_emits_nothing() -> None:
+    scening_list = make_list((10, 20), max_value=100)
+    events = record_events(scening_list)
+
+    assert scening_list.add_many([(Frame(10), Frame(20), ''), (Frame(150), None, '')]) == 1
+    assert events == []
+
+
+def test_rows_at_overlapping_scenes() -> None:
+    scening_list = make_list((0, 50), (20, 150), (100, 200))
+
+    assert scening_list.rows_at(Frame(25)) == [0, 1]
+    assert scening_list.rows_at(Frame(75)) == [1]
+    assert scening_list.rows_at(Frame(120)) == [1, 2]
+    assert scening_list.rows_at(Frame(250)) == []
+
+    assert Frame(75) in scening_list
+    assert Frame(250) not in scening_list
+
+
+def test_rows_at_unsorted_rows() -> None:
+    scening_list = make_list((100, 200), (0, 50), (20, 30))
+
+    assert scening_list.rows_at(Frame(25)) == [1, 2]
+    assert scening_list.rows_at(Frame(150)) == [0]
+    assert scening_list.rows_at(Frame(75)) == []
+
+    assert Frame(75) not in scening_list
+    assert Frame(150) in scening_list
+
+
+def test_frame_index_follows_mutations() -> None:
+    scening_list = make_list((0, 10))
+
+    assert Frame(20) not in scening_list
+
+    scening_list.add(Frame(15), Frame(25))
+    assert Frame(20) in scening_list
+    assert scening_list.rows_at(Frame(20)) == [1]
+
+    scening_list.remove(1)
+    assert Frame(20) not in scening_list
@@ -78,14 +78,30 @@ class Notches:
             return
 
         if isinstance(other, Sequence):
-            for notch in other:
-                self.add(notch, color, label)
+            self.add_many(other, color, label)
 
     def add(
         self, data: NotchT, color: QColor | Qt.GlobalColor | None = None, label: str | None = None
     ) -> None:
         self.items.extend(Notch.from_param(data, color, label))
 
+    def add_many(
+        self, data: Iterable[NotchT], color: QColor | Qt.GlobalColor | None = None, label: str | None = None
+    ) -> None:
+        color = fallback(color, Qt.GlobalColor.white)
+        items = self.items
+
+        for item in data:
+            # scenes are by far the most common, so skip the generic dispatch for them
+            if isinstance(item, Scene):
+                scene_label = label or item.label
+                items.append(Notch(item.start, color, scene_label))
+
+                if item.end != item.start:
+                    items.append(Notch(item.end, color, scene_label))
+            else:
+                items.extend(Notch.from_param(item, color, label))
+
     def __len__(self) -> int:
         return len(self.items)
 
@@ -2,7 +2,9 @@ from __future__ import annotations
 
 from bisect import bisect_right
 from copy import deepcopy
-from typing import Any, Iterator
+from itertools import accumulate
+from operator import itemgetter
+from typing import Any, Iterable, Iterator
 
 from PyQt6.QtCore import QAbstractListModel, QAbstractTableModel, QModelIndex, Qt
 
@@ -34,6 +36,9 @@ class SceningList(QAbstractTableModel, QYAMLObject):
         self.items = items if items is not None else []
         self.temporary = temporary
 
+        # starts, ends, running max of ends and rows of the scenes sorted by start, rebuilt lazily after any mutation
+        self._frame_index: tuple[list[int], list[int], list[int], list[int]] | None = None
+
         self.main = main_window()
 
     def rowCount(self, parent: QModelIndex = QModelIndex()) -> int:
@@ -157,9 +162,11 @@ class SceningList(QAbstractTableModel, QYAMLObject):
                 self.beginMoveRows(self.createIndex(row, 0), row, row, self.createIndex(i, 0), i)
                 del self.items[row]
                 self.items.insert(i, scene)
+                self._frame_index = None
                 self.endMoveRows()
             else:
                 self.items[index.row()] = scene
+                self._frame_index = None
                 self.dataChanged.emit(index, index)
         else:
             self.items[index.row()] = scene
@@ -177,18 +184,45 @@ class SceningList(QAbstractTableModel, QYAMLObject):
             raise IndexError
 
         self.items[i] = value
+        self._frame_index = None
         self.dataChanged.emit(self.createIndex(i, 0), self.createIndex(i, self.COLUMN_COUNT - 1))
 
     def __contains__(self, item: Scene | Frame) -> bool:
         if isinstance(item, Scene):
             return item in self.items
         if isinstance(item, Frame):
-            for scene in self.items:
-                if item in scene:
-                    return True
-            return False
+            starts, _, max_ends, _ = self.get_frame_index()
+            i = bisect_right(starts, int(item))
+            return i > 0 and max_ends[i - 1] >= int(item)
         raise TypeError
 
+    def get_frame_index(self) -> tuple[list[int], list[int], list[int], list[int]]:
+        # scenes sorted by start, so bisecting the starts finds the last scene that can contain a frame
+        # and the running maximum of ends tells when no earlier scene can reach it anymore.
+        # rows aren't guaranteed to be in that order, so the row of every entry is kept alongside
+        if self._frame_index is None:
+            bounds = sorted((int(scene.start), int(scene.end), row) for row, scene in enumerate(self.items))
+            starts = [start for start, _, _ in bounds]
+            ends = [end for _, end, _ in bounds]
+            rows = [row for _, _, row in bounds]
+            self._frame_index = (starts, ends, list(accumulate(ends, max)), rows)
+
+        return self._frame_index
+
+    def rows_at(self, frame: Frame) -> list[int]:
+        starts, ends, max_ends, rows = self.get_frame_index()
+        value = int(frame)
+
+        result = list[int]()
+        i = bisect_right(starts, value) - 1
+
+        while i >= 0 and max_ends[i] >= value:
+            if starts[i] <= value <= ends[i]:
+                result.append(rows[i])
+            i -= 1
+
+        return sorted(result)
+
     def __iter__(self) -> Iterator[Scene]:
         return iter(self.items)
 
@@ -204,10 +238,58 @@ class SceningList(QAbstractTableModel, QYAMLObject):
         index = bisect_right(self.items, scene)
         self.beginInsertRows(QModelIndex(), index, index)
         self.items.insert(index, scene)
+        self._frame_index = None
         self.endInsertRows()
 
         return scene
 
+    def add_many(self, scenes: Iterable[tuple[Frame, Frame | None, str]]) -> int:
+        max_value = int(self.max_value)
+        known = {(int(scene.start), int(scene.end)) for scene in self.items}
+
+        new_items = list[tuple[int, int, Scene]]()
+        out_of_range_count = 0
+
+        for start, end, label in scenes:
+            key = (int(start), int(end if end is not None else start))
+
+            if key[0] > key[1]:
+                key = (key[1], key[0])
+
+            if key in known:
+                continue
+
+            if key[1] > max_value:
+                out_of_range_count += 1
+                continue
+
+            known.add(key)
+            new_items.append((*key, Scene(start, end, label)))
+
+        if not new_items:
+            return out_of_range_count
+
+        new_items.sort(key=itemgetter(0, 1))
+
+        # appending keeps views in place, anything else has to be merged in and the model reset
+        if not self.items or new_items[0][2] > self.items[-1]:
+            i = len(self.items)
+            self.beginInsertRows(QModelIndex(), i, i + len(new_items) - 1)
+            self.items.extend(scene for _, _, scene in new_items)
+            self._frame_index = None
+            self.endInsertRows()
+        else:
+            self.beginResetModel()
+            # both runs are already sorted, which sort detects and just merges
+            self.items = sorted(
+                self.items + [scene for _, _, scene in new_items],
+                key=lambda scene: (int(scene.start), int(scene.end))
+            )
+            self._frame_index = None
+            self.endResetModel()
+
+        return out_of_range_count
+
     def remove(self, i: int | Scene) -> None:
         if isinstance(i, Scene):
             i = self.items.index(i)
@@ -215,10 +297,23 @@ class SceningList(QAbstractTableModel, QYAMLObject):
         if i >= 0 and i < len(self.items):
             self.beginRemoveRows(QModelIndex(), i, i)
             del self.items[i]
+            self._frame_index = None
             self.endRemoveRows()
         else:
             raise IndexError
 
+    def remove_at(self, frame: Frame) -> int:
+        rows = [i for i, scene in enumerate(self.items) if scene.start == frame or scene.end == frame]
+
+        # back to front, so the rows that are still pending keep their index
+        for i in reversed(rows):
+            self.beginRemoveRows(QModelIndex(), i, i)
+            del self.items[i]
+            self._frame_index = None
+            self.endRemoveRows()
+
+        return len(rows)
+
     def get_prev_frame(self, initial: Frame) -> Frame | None:
         result = None
         result_delta = Frame(int(self.max_value))
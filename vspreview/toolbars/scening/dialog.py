@@ -88,10 +88,9 @@ class SceningListDialog(ExtendedDialog):
         if self.tableview.selectionModel() is None:
             return
         selection = QItemSelection()
-        for i, scene in enumerate(self.scening_list):
-            if frame in scene:
-                index = self.scening_list.index(i, 0)
-                selection.select(index, index)
+        for i in self.scening_list.rows_at(frame):
+            index = self.scening_list.index(i, 0)
+            selection.select(index, index)
         self.tableview.selectionModel().select(
             selection,
             QItemSelectionModel.SelectionFlag.Rows
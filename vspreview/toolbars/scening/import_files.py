@@ -1,9 +1,12 @@
 from __future__ import annotations
 
 import logging
+import mmap
 import re
-from copy import deepcopy
+from bisect import bisect_right
+from contextlib import contextmanager
 from pathlib import Path
+from typing import Iterator
 
 from ...core import Frame, Time
 from ...models import SceningList
@@ -13,13 +16,45 @@ __all__ = [
 ]
 
 
+# CUE sheets count 75 frames per second
+_CUE_MS_PER_FRAME = 1000 / 75
+_CUE_OFFSET_RE = re.compile(r'(\d{1,2}):(\d{1,2}):(\d{1,2})')
+_DGI_RE = re.compile(rb'IDR\s\d+\r?\n(\d+):FRM', re.RegexFlag.MULTILINE)
+_LWI_RE = re.compile(rb'Index=0.*?Codec=(\d+).*?\n.*?Key=(\d)')
+_XML_TS_RE = re.compile(r'(\d{2}):(\d{2}):(\d{2}(?:\.\d{3})?)')
+_OGM_TS_RE = re.compile(rb'(CHAPTER\d+)=(\d+):(\d+):(\d+(?:\.\d+)?)')
+_OGM_NAME_RE = re.compile(rb'(CHAPTER\d+)NAME=(.*)')
+_QP_RE = re.compile(rb'(\d+)\s[IK]')
+_MKV_TS_V1_RE = re.compile(rb'(\d+),(\d+),(\d+(?:\.\d+)?)')
+_MKV_TS_V3_RE = re.compile(r'^((?:\d+(?:\.\d+)?)|gap)(?:,\s?(\d+(?:\.\d+)?))?', re.RegexFlag.MULTILINE)
+_MKV_TS_V3_ASSUME_RE = re.compile(r'assume (\d+(?:\.\d+))')
+_TFM_FRAME_RE = re.compile(rb'(\d+)\s\((\d+)\)')
+_TFM_GROUP_RE = re.compile(rb'(\d+),(\d+)\s\((\d+(?:\.\d+)%)\)')
+_X264_2PASS_RE = re.compile(r'in:(\d+).*type:[IK]')
+# either a line starting with two frame numbers or any other non-blank line, which is counted as a failure
+_GENERIC_RE = re.compile(rb'^[ \t]*(?:(\d+)[ \t]+(\d+)(?:[ \t]+\d+)*[ \t]*\r?$|.*\S)', re.RegexFlag.MULTILINE)
+
+
+@contextmanager
+def _mmap_bytes(path: Path) -> Iterator[mmap.mmap | bytes]:
+    """
+    Maps the file read-only, so big logs can be scanned without decoding them into a str.
+    Empty files can't be mapped, so they yield empty bytes instead.
+    """
+    with path.open('rb') as f:
+        if path.stat().st_size == 0:
+            yield b''
+            return
+
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+            yield mm
+
+
 def import_ass(path: Path, scening_list: SceningList) -> int:
     """
     Imports lines as scenes.
     Text is ignored.
     """
-    out_of_range_count = 0
-
     try:
         from pysubs2 import load as pysubs2_load  # type: ignore[import-not-found]
     except ModuleNotFoundError:
@@ -28,15 +63,11 @@ def import_ass(path: Path, scening_list: SceningList) -> int:
         )
 
     subs = pysubs2_load(str(path))
-    for line in subs:
-        t_start = Time(milliseconds=line.start)
-        t_end = Time(milliseconds=line.end)
-        try:
-            scening_list.add(Frame(t_start), Frame(t_end))
-        except ValueError:
-            out_of_range_count += 1
 
-    return out_of_range_count
+    return scening_list.add_many(
+        (Frame(Time(milliseconds=line.start)), Frame(Time(milliseconds=line.end)), '')
+        for line in subs
+    )
 
 
 def import_celltimes(path: Path, scening_list: SceningList) -> int:
@@ -44,14 +75,16 @@ def import_celltimes(path: Path, scening_list: SceningList) -> int:
     Imports cell times as single-frame scenes
     """
     out_of_range_count = 0
+    scenes = list[tuple[Frame, Frame | None, str]]()
 
-    for line in path.read_text('utf8').splitlines():
-        try:
-            scening_list.add(Frame(int(line)))
-        except ValueError:
-            out_of_range_count += 1
+    with path.open('rb') as f:
+        for line in f:
+            try:
+                scenes.append((Frame(int(line)), None, ''))
+            except ValueError:
+                out_of_range_count += 1
 
-    return out_of_range_count
+    return out_of_range_count + scening_list.add_many(scenes)
 
 
 def import_cue(path: Path, scening_list: SceningList) -> int:
@@ -59,8 +92,6 @@ def import_cue(path: Path, scening_list: SceningList) -> int:
     Imports tracks as scenes.
     Uses TITLE for scene label.
     """
-    out_of_range_count = 0
-
     try:
         from cueparser import CueSheet  # type: ignore[import-not-found]
     except ModuleNotFoundError:
@@ -69,17 +100,18 @@ def import_cue(path: Path, scening_list: SceningList) -> int:
         )
 
     def offset_to_time(offset: str) -> Time | None:
-        pattern = re.compile(r'(\d{1,2}):(\d{1,2}):(\d{1,2})')
-        match = pattern.match(offset)
+        match = _CUE_OFFSET_RE.match(offset)
         if match is None:
             return None
-        return Time(minutes=int(match[1]), seconds=int(match[2]), milliseconds=int(match[3]) / 75 * 1000)
+        return Time(minutes=int(match[1]), seconds=int(match[2]), milliseconds=int(match[3]) * _CUE_MS_PER_FRAME)
 
     cue_sheet = CueSheet()
     cue_sheet.setOutputFormat('')
     cue_sheet.setData(path.read_text('utf8'))
     cue_sheet.parse()
 
+    scenes = list[tuple[Frame, Frame | None, str]]()
+
     for track in cue_sheet.tracks:
         if track.offset is None:
             continue
@@ -97,29 +129,17 @@ def import_cue(path: Path, scening_list: SceningList) -> int:
         if track.title is not None:
             label = track.title
 
-        try:
-            scening_list.add(start, end, label)
-        except ValueError:
-            out_of_range_count += 1
+        scenes.append((start, end, label))
 
-    return out_of_range_count
+    return scening_list.add_many(scenes)
 
 
 def import_dgi(path: Path, scening_list: SceningList) -> int:
     """
     Imports IDR frames as single-frame scenes.
     """
-    out_of_range_count = 0
-
-    pattern = re.compile(r'IDR\s\d+\n(\d+):FRM', re.RegexFlag.MULTILINE)
-
-    for match in pattern.findall(path.read_text('utf8')):
-        try:
-            scening_list.add(Frame(match))
-        except ValueError:
-            out_of_range_count += 1
-
-    return out_of_range_count
+    with _mmap_bytes(path) as data:
+        return scening_list.add_many((Frame(int(match[1])), None, '') for match in _DGI_RE.finditer(data))
 
 
 def import_lwi(path: Path, scening_list: SceningList) -> int:
@@ -127,34 +147,22 @@ def import_lwi(path: Path, scening_list: SceningList) -> int:
     Imports Key=1 frames as single-frame scenes.
     Ignores everything besides Index=0 video stream.
     """
-    out_of_range_count = 0
-
     AV_CODEC_ID_FIRST_AUDIO = 0x10000
-    STREAM_INDEX = 0
     IS_KEY = 1
 
-    pattern = re.compile(r'Index={}.*?Codec=(\d+).*?\n.*?Key=(\d)'.format(
-        STREAM_INDEX
-    ))
+    scenes = list[tuple[Frame, Frame | None, str]]()
 
-    frame = Frame(0)
-    for match in pattern.finditer(path.read_text('utf8'), re.RegexFlag.MULTILINE):
-        if int(match[1]) >= AV_CODEC_ID_FIRST_AUDIO:
-            frame += Frame(1)
-            continue
-
-        if not int(match[2]) == IS_KEY:
-            frame += Frame(1)
-            continue
+    with _mmap_bytes(path) as data:
+        for frame, match in enumerate(_LWI_RE.finditer(data)):
+            if int(match[1]) >= AV_CODEC_ID_FIRST_AUDIO:
+                continue
 
-        try:
-            scening_list.add(deepcopy(frame))
-        except ValueError:
-            out_of_range_count += 1
+            if not int(match[2]) == IS_KEY:
+                continue
 
-        frame += Frame(1)
+            scenes.append((Frame(frame), None, ''))
 
-    return out_of_range_count
+    return scening_list.add_many(scenes)
 
 
 def import_matroska_xml_chapters(path: Path, scening_list: SceningList) -> int:
@@ -163,44 +171,42 @@ def import_matroska_xml_chapters(path: Path, scening_list: SceningList) -> int:
     Preserve end time and text if they're present.
     """
     from xml.etree import ElementTree
-    out_of_range_count = 0
 
-    timestamp_pattern = re.compile(r'(\d{2}):(\d{2}):(\d{2}(?:\.\d{3})?)')
+    scenes = list[tuple[Frame, Frame | None, str]]()
+
+    def element_to_frame(element: ElementTree.Element | None) -> Frame | None:
+        if element is None or element.text is None:
+            return None
+        match = _XML_TS_RE.match(element.text)
+        if match is None:
+            return None
+        return Frame(Time(hours=int(match[1]), minutes=int(match[2]), seconds=float(match[3])))
 
     try:
-        root = ElementTree.parse(str(path)).getroot()
-    except ElementTree.ParseError as exc:
-        logging.warning(f"Scening import: error occurred while parsing '{path.name}':")
-        logging.warning(exc.msg)
-        return out_of_range_count
+        for _, chapter in ElementTree.iterparse(str(path), events=('end',)):
+            if chapter.tag != 'ChapterAtom':
+                continue
 
-    for chapter in root.iter('ChapterAtom'):
-        start_element = chapter.find('ChapterTimeStart')
-        if start_element is None or start_element.text is None:
-            continue
-        match = timestamp_pattern.match(start_element.text)
-        if match is None:
-            continue
-        start = Frame(Time(hours=int(match[1]), minutes=int(match[2]), seconds=float(match[3])))
+            start = element_to_frame(chapter.find('ChapterTimeStart'))
+            end = element_to_frame(chapter.find('ChapterTimeEnd'))
 
-        end = None
-        end_element = chapter.find('ChapterTimeEnd')
-        if end_element is not None and end_element.text is not None:
-            match = timestamp_pattern.match(end_element.text)
-            if match is not None:
-                end = Frame(Time(hours=int(match[1]), minutes=int(match[2]), seconds=float(match[3])))
+            label = ''
+            label_element = chapter.find('ChapterDisplay/ChapterString')
+            if label_element is not None and label_element.text is not None:
+                label = label_element.text
 
-        label = ''
-        label_element = chapter.find('ChapterDisplay/ChapterString')
-        if label_element is not None and label_element.text is not None:
-            label = label_element.text
+            # nested atoms were already handled, so the subtree isn't needed anymore
+            chapter.clear()
 
-        try:
-            scening_list.add(start, end, label)
-        except ValueError:
-            out_of_range_count += 1
+            if start is None:
+                continue
 
-    return out_of_range_count
+            scenes.append((start, end, label))
+    except ElementTree.ParseError as exc:
+        logging.warning(f"Scening import: error occurred while parsing '{path.name}':")
+        logging.warning(exc.msg)
+
+    return scening_list.add_many(scenes)
 
 
 def import_ogm_chapters(path: Path, scening_list: SceningList) -> int:
@@ -208,44 +214,35 @@ def import_ogm_chapters(path: Path, scening_list: SceningList) -> int:
     Imports chapters as single-frame scenes.
     Uses NAME for scene label.
     """
-    out_of_range_count = 0
+    # chapter id -> timestamp, waiting for its NAME line
+    timestamps = dict[bytes, Time]()
+    scenes = list[tuple[Frame, Frame | None, str]]()
 
-    pattern = re.compile(
-        r'(CHAPTER\d+)=(\d+):(\d+):(\d+(?:\.\d+)?)\n\1NAME=(.*)',
-        re.RegexFlag.MULTILINE
-    )
-    for match in pattern.finditer(path.read_text('utf8')):
-        time = Time(hours=int(match[2]), minutes=int(match[3]), seconds=float(match[4]))
-        try:
-            scening_list.add(Frame(time), label=match[5])
-        except ValueError:
-            out_of_range_count += 1
+    with path.open('rb') as f:
+        for line in f:
+            line = line.rstrip(b'\r\n')
 
-    return out_of_range_count
+            if match := _OGM_NAME_RE.search(line):
+                if (time := timestamps.pop(match[1], None)) is not None:
+                    scenes.append((Frame(time), None, match[2].decode('utf-8', 'replace')))
+            elif match := _OGM_TS_RE.search(line):
+                timestamps[match[1]] = Time(hours=int(match[2]), minutes=int(match[3]), seconds=float(match[4]))
+
+    return scening_list.add_many(scenes)
 
 
 def import_qp(path: Path, scening_list: SceningList) -> int:
     """
     Imports I- and K-frames as single-frame scenes.
     """
-    out_of_range_count = 0
-
-    pattern = re.compile(r'(\d+)\sI|K')
-    for match in pattern.findall(path.read_text('utf8')):
-        try:
-            scening_list.add(Frame(int(match)))
-        except ValueError:
-            out_of_range_count += 1
-
-    return out_of_range_count
+    with _mmap_bytes(path) as data:
+        return scening_list.add_many((Frame(int(match[1])), None, '') for match in _QP_RE.finditer(data))
 
 
 def import_ses(path: Path, scening_list: SceningList) -> int:
     """
     Imports bookmarks as single-frame scenes
     """
-    out_of_range_count = 0
-
     import pickle
 
     with path.open('rb') as f:
@@ -253,18 +250,12 @@ def import_ses(path: Path, scening_list: SceningList) -> int:
             session = pickle.load(f)
         except pickle.UnpicklingError:
             logging.warning('Scening import: failed to load .ses file.')
-            return out_of_range_count
+            return 0
 
     if 'bookmarks' not in session:
-        return out_of_range_count
+        return 0
 
-    for bookmark in session['bookmarks']:
-        try:
-            scening_list.add(Frame(bookmark[0]))
-        except ValueError:
-            out_of_range_count += 1
-
-    return out_of_range_count
+    return scening_list.add_many((Frame(bookmark[0]), None, '') for bookmark in session['bookmarks'])
 
 
 def import_matroska_timestamps_v1(path: Path, scening_list: SceningList) -> int:
@@ -272,19 +263,11 @@ def import_matroska_timestamps_v1(path: Path, scening_list: SceningList) -> int:
     Imports listed scenes.
     Uses FPS for scene label.
     """
-    out_of_range_count = 0
-
-    pattern = re.compile(r'(\d+),(\d+),(\d+(?:\.\d+)?)')
-
-    for match in pattern.finditer(path.read_text('utf8')):
-        try:
-            scening_list.add(
-                Frame(int(match[1])), Frame(int(match[2])), '{:.3f} fps'.format(float(match[3]))
-            )
-        except ValueError:
-            out_of_range_count += 1
-
-    return out_of_range_count
+    with _mmap_bytes(path) as data:
+        return scening_list.add_many(
+            (Frame(int(match[1])), Frame(int(match[2])), '{:.3f} fps'.format(float(match[3])))
+            for match in _MKV_TS_V1_RE.finditer(data)
+        )
 
 
 def import_matroska_timestamps_v2(path: Path, scening_list: SceningList) -> int:
@@ -292,51 +275,51 @@ def import_matroska_timestamps_v2(path: Path, scening_list: SceningList) -> int:
     Imports intervals of constant FPS as scenes.
     Uses FPS for scene label.
     """
-    out_of_range_count = 0
+    import numpy as np
 
-    timestamps = list[Time]()
-    for line in path.read_text('utf8').splitlines():
-        try:
-            timestamps.append(Time(milliseconds=float(line)))
-        except ValueError:
-            continue
+    try:
+        timestamps = np.loadtxt(path, np.float64, comments='#', ndmin=1, encoding='utf8')
+    except ValueError:
+        timestamps = None
+
+    # malformed lines or extra columns, parse it line by line and skip whatever isn't a single timestamp
+    if timestamps is None or timestamps.ndim != 1:
+        values = list[float]()
+        with path.open('rb') as f:
+            for line in f:
+                try:
+                    values.append(float(line))
+                except ValueError:
+                    continue
+        timestamps = np.array(values, np.float64)
 
     if len(timestamps) < 2:
         logging.warning(
             "Scening import: timestamps file contains less than 2 timestamps, so there's nothing to import."
         )
-        return out_of_range_count
-
-    deltas = [
-        timestamps[i] - timestamps[i - 1]
-        for i in range(1, len(timestamps))
-    ]
-    scene_delta = deltas[0]
-    scene_start = Frame(0)
-    scene_end: Frame | None = None
-    for i in range(1, len(deltas)):
-        if abs(round(float(deltas[i] - scene_delta), 6)) <= 0.000_001:
+        return 0
+
+    # work in whole microseconds, like the timedelta behind Time does
+    deltas = np.diff(np.rint(timestamps * 1000).astype(np.int64))
+
+    # deltas only need to be compared against the scene's one where they actually change
+    changes = np.flatnonzero(np.diff(deltas)) + 1
+
+    scenes = list[tuple[Frame, Frame | None, str]]()
+
+    scene_delta = int(deltas[0])
+    scene_start = 0
+    for i, delta in zip(changes.tolist(), deltas[changes].tolist()):
+        if abs(delta - scene_delta) <= 1:
             continue
         # TODO: investigate, why offset by -1 is necessary here
-        scene_end = Frame(i - 1)
-        try:
-            scening_list.add(scene_start, scene_end, '{:.3f} fps'.format(1 / float(scene_delta)))
-        except ValueError:
-            out_of_range_count += 1
-        scene_start = Frame(i)
-        scene_end = None
-        scene_delta = deltas[i]
+        scenes.append((Frame(scene_start), Frame(i - 1), '{:.3f} fps'.format(1_000_000 / scene_delta)))
+        scene_start = i
+        scene_delta = delta
 
-    if scene_end is None:
-        try:
-            scening_list.add(
-                scene_start, Frame(len(timestamps) - 1),
-                '{:.3f} fps'.format(1 / float(scene_delta))
-            )
-        except ValueError:
-            out_of_range_count += 1
+    scenes.append((Frame(scene_start), Frame(len(timestamps) - 1), '{:.3f} fps'.format(1_000_000 / scene_delta)))
 
-    return out_of_range_count
+    return scening_list.add_many(scenes)
 
 
 def import_matroska_timestamps_v3(path: Path, scening_list: SceningList) -> int:
@@ -344,22 +327,18 @@ def import_matroska_timestamps_v3(path: Path, scening_list: SceningList) -> int:
     Imports listed scenes, ignoring gaps.
     Uses FPS for scene label.
     """
-    out_of_range_count = 0
+    text = path.read_text('utf8')
 
-    pattern = re.compile(
-        r'^((?:\d+(?:\.\d+)?)|gap)(?:,\s?(\d+(?:\.\d+)?))?',
-        re.RegexFlag.MULTILINE
-    )
-
-    assume_pattern = re.compile(r'assume (\d+(?:\.\d+))')
-    if len(mmatch := assume_pattern.findall(path.read_text('utf8'))) > 0:
+    if len(mmatch := _MKV_TS_V3_ASSUME_RE.findall(text)) > 0:
         default_fps = float(mmatch[0])
     else:
         logging.warning('Scening import: "assume" entry not found.')
-        return out_of_range_count
+        return 0
+
+    scenes = list[tuple[Frame, Frame | None, str]]()
 
     pos = Time()
-    for match in pattern.finditer(path.read_text('utf8')):
+    for match in _MKV_TS_V3_RE.finditer(text):
         if match[1] == 'gap':
             pos += Time(seconds=float(match[2]))
             continue
@@ -367,18 +346,33 @@ def import_matroska_timestamps_v3(path: Path, scening_list: SceningList) -> int:
         interval = Time(seconds=float(match[1]))
         fps = float(match[2]) if (match.lastindex or 0) >= 2 else default_fps
 
-        try:
-            scening_list.add(Frame(pos), Frame(pos + interval), '{:.3f} fps'.format(fps))
-        except ValueError:
-            out_of_range_count += 1
+        scenes.append((Frame(pos), Frame(pos + interval), '{:.3f} fps'.format(fps)))
 
         pos += interval
 
-    return out_of_range_count
+    return scening_list.add_many(scenes)
 
 
-class TFMFrame(Frame):
-    mic: int | None
+def _merge_intervals(intervals: list[tuple[int, int]]) -> tuple[list[int], list[int]]:
+    """
+    Sorts and merges overlapping inclusive intervals,
+    returning their starts and ends as two parallel lists.
+    """
+    starts, ends = list[int](), list[int]()
+
+    for start, end in sorted(intervals):
+        if ends and start <= ends[-1] + 1:
+            ends[-1] = max(ends[-1], end)
+        else:
+            starts.append(start)
+            ends.append(end)
+
+    return starts, ends
+
+
+def _in_any_interval(value: int, starts: list[int], ends: list[int]) -> bool:
+    i = bisect_right(starts, value) - 1
+    return i >= 0 and value <= ends[i]
 
 
 def import_tfm(path: Path, scening_list: SceningList) -> int:
@@ -388,42 +382,41 @@ def import_tfm(path: Path, scening_list: SceningList) -> int:
     Frame groups are put into regular scenes.
     Combed probability is used for label.
     """
-    out_of_range_count = 0
+    import numpy as np
 
-    tfm_frame_pattern = re.compile(r'(\d+)\s\((\d+)\)')
-    tfm_group_pattern = re.compile(r'(\d+),(\d+)\s\((\d+(?:\.\d+)%)\)')
+    with _mmap_bytes(path) as log:
+        start_pos = log.find(b'OVR HELP INFORMATION')
+        if start_pos == -1:
+            logging.warning("Scening import: TFM log doesn't contain OVR Help Information.")
+            return 0
 
-    log = path.read_text('utf8')
+        frame_hits = _TFM_FRAME_RE.findall(log, start_pos)
+        group_hits = _TFM_GROUP_RE.findall(log, start_pos)
 
-    start_pos = log.find('OVR HELP INFORMATION')
-    if start_pos == -1:
-        logging.warning("Scening import: TFM log doesn't contain OVR Help Information.")
-        return out_of_range_count
+    frame_mics = np.array(frame_hits, np.bytes_).reshape(-1, 2).astype(np.int64)
 
-    log = log[start_pos:]
+    groups = np.array(group_hits, np.bytes_).reshape(-1, 3)
+    group_bounds = groups[:, :2].astype(np.int64).tolist()
+    group_combed = groups[:, 2].astype(np.str_).tolist()
 
-    tfm_frames = set[TFMFrame]()
-    for match in tfm_frame_pattern.finditer(log):
-        tfm_frame = TFMFrame(int(match[1]))
-        tfm_frame.mic = int(match[2])
-        tfm_frames.add(tfm_frame)
-
-    for match in tfm_group_pattern.finditer(log):
-        try:
-            scene = scening_list.add(Frame(int(match[1])), Frame(int(match[2])), f'{match[3]} combed')
-        except ValueError:
-            out_of_range_count += 1
-            continue
+    # frame number -> mic, built from the back so the first mic listed for a frame wins
+    tfm_frames = dict(zip(frame_mics[::-1, 0].tolist(), frame_mics[::-1, 1].tolist()))
 
-        tfm_frames -= set(range(int(scene.start), int(scene.end) + 1))
+    out_of_range_count = scening_list.add_many(
+        (Frame(start), Frame(end), f'{combed} combed')
+        for (start, end), combed in zip(group_bounds, group_combed)
+    )
 
-    for tfm_frame in tfm_frames:
-        try:
-            scening_list.add(tfm_frame, label=str(tfm_frame.mic))
-        except ValueError:
-            out_of_range_count += 1
+    # only groups that made it into the list hide their single frames
+    max_value = int(scening_list.max_value)
+    starts, ends = _merge_intervals([
+        (min(start, end), max(start, end)) for start, end in group_bounds if max(start, end) <= max_value
+    ])
 
-    return out_of_range_count
+    return out_of_range_count + scening_list.add_many(
+        (Frame(frame), None, str(mic))
+        for frame, mic in tfm_frames.items() if not _in_any_interval(frame, starts, ends)
+    )
 
 
 def import_vsedit(path: Path, scening_list: SceningList) -> int:
@@ -451,46 +444,27 @@ def import_vsedit(path: Path, scening_list: SceningList) -> int:
             ranges.append([x])
         prev_x = int(x)
 
-    for rang in ranges:
-        scening_list.add(
-            Frame(rang[0]),
-            Frame(rang[-1]) if len(rang) > 1 else None
-        )
-
-    return out_of_range_count
+    return out_of_range_count + scening_list.add_many(
+        (Frame(rang[0]), Frame(rang[-1]) if len(rang) > 1 else None, '')
+        for rang in ranges
+    )
 
 
 def import_x264_2pass_log(path: Path, scening_list: SceningList) -> int:
     """
     Imports I- and K-frames as single-frame scenes.
     """
-    out_of_range_count = 0
-
-    pattern = re.compile(r'in:(\d+).*type:I|K')
-    for match in pattern.findall(path.read_text('utf8')):
-        try:
-            scening_list.add(Frame(int(match)))
-        except ValueError:
-            out_of_range_count += 1
-
-    return out_of_range_count
+    return scening_list.add_many(
+        (Frame(int(match)), None, '') for match in _X264_2PASS_RE.findall(path.read_text('utf8'))
+    )
 
 
 def import_xvid(path: Path, scening_list: SceningList) -> int:
     """
     Imports I-frames as single-frame scenes.
     """
-    out_of_range_count = 0
-
-    for i, line in enumerate(path.read_text('utf8').splitlines()):
-        if not line.startswith('i'):
-            continue
-        try:
-            scening_list.add(Frame(i - 3))
-        except ValueError:
-            out_of_range_count += 1
-
-    return out_of_range_count
+    with path.open('rb', buffering=1 << 20) as f:
+        return scening_list.add_many((Frame(i - 3), None, '') for i, line in enumerate(f) if line.startswith(b'i'))
 
 
 def import_generic(path: Path, scening_list: SceningList) -> int:
@@ -499,15 +473,17 @@ def import_generic(path: Path, scening_list: SceningList) -> int:
 
     """
     out_of_range_count = 0
+    scenes = list[tuple[Frame, Frame | None, str]]()
 
-    for line in path.read_text('utf8').splitlines():
-        try:
-            fnumbers = [int(n) for n in line.split()]
-            scening_list.add(Frame(fnumbers[0]), Frame(fnumbers[1]))
-        except ValueError:
-            out_of_range_count += 1
+    with _mmap_bytes(path) as data:
+        for start, end in map(re.Match.groups, _GENERIC_RE.finditer(data)):
+            if start is None:
+                out_of_range_count += 1
+                continue
+
+            scenes.append((Frame(int(start)), Frame(int(end)), ''))
 
-    return out_of_range_count
+    return out_of_range_count + scening_list.add_many(scenes)
 
 
 supported_file_types = {
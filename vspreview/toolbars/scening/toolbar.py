@@ -2,16 +2,21 @@ from __future__ import annotations
 
 import logging
 import re
+from collections import OrderedDict
 from functools import partial
+from io import StringIO
+from itertools import batched
 from pathlib import Path
-from typing import TYPE_CHECKING, Any, Callable, cast
+from string import Formatter
+from threading import Lock
+from typing import TYPE_CHECKING, Any, Callable, Iterable, Iterator
 
-from PyQt6.QtCore import QKeyCombination, QModelIndex, Qt
-from PyQt6.QtGui import QColor
-from PyQt6.QtWidgets import QFileDialog, QLabel
+from PyQt6.QtCore import QKeyCombination, QMimeData, Qt, pyqtSignal
+from PyQt6.QtWidgets import QFileDialog, QLabel, QProgressDialog
 
 from ...core import (
-    AbstractToolbar, CheckBox, ComboBox, Frame, HBoxLayout, LineEdit, Notches, PushButton, Time, try_load
+    AbstractToolbar, CheckBox, ComboBox, Frame, HBoxLayout, LineEdit, Notches, PushButton, Scene, Time, Timer,
+    storage_err_msg, try_load
 )
 from ...models import SceningList, SceningLists
 from ...utils import fire_and_forget, set_status_label
@@ -28,6 +33,13 @@ __all__ = [
 ]
 
 
+# literal text, field name, format spec and conversion of each placeholder, as yielded by Formatter.parse
+_TemplateFields = list[tuple[str, str | None, str | None, str | None]]
+
+# splits attribute and index access off a placeholder's field name
+_FIELD_NAME_ACCESS_RE = re.compile(r'[.\[]')
+
+
 class SceningToolbar(AbstractToolbar):
     storable_attrs = ('current_list_index', 'lists', 'first_frame', 'second_frame')
 
@@ -37,15 +49,30 @@ class SceningToolbar(AbstractToolbar):
         'scening_list_dialog',
         'add_list_button', 'remove_list_button', 'view_list_button',
         'toggle_first_frame_button', 'toggle_second_frame_button',
-        'add_single_frame_button',
+        'add_single_frame_button', 'label_lineedit',
         'add_to_list_button', 'remove_last_from_list_button',
         'export_button', 'export_template_lineedit',
         'always_show_scene_marks_checkbox',
         'status_label', 'import_file_button', 'items_combobox',
         'remove_at_current_frame_button',
-        'seek_to_next_button', 'seek_to_prev_button'
+        'seek_to_next_button', 'seek_to_prev_button',
+        'export_template_timer', '_export_templates',
+        '_import_cache', '_import_cache_lock', '_notches_cache'
     )
 
+    import_cache_size = 16
+    import_filter_str = ';;'.join(supported_file_types)
+
+    export_formatter = Formatter()
+    export_template_fields = frozenset({'start', 'end', 'label', 'script_name'})
+    export_template_check_delay = 150
+    export_progress_chunk_size = 10000
+    export_templates_cache_size = 64
+
+    # declared as object so PyQt keeps the Python wrapper alive while the emit is queued across threads,
+    # a SceningList type would only pass the C++ pointer and the worker's list would be collected on the way
+    scening_list_imported = pyqtSignal(object)
+
     settings: SceningSettings
 
     def __init__(self, main: MainWindow) -> None:
@@ -56,8 +83,17 @@ class SceningToolbar(AbstractToolbar):
 
         self.first_frame: Frame | None = None
         self.second_frame: Frame | None = None
-        self.export_template_pattern = re.compile(r'.*(?:{start}|{end}|{label}).*')
+        # a placeholder for any scene field, optionally with attribute/index access, conversion or format spec
+        self.export_template_pattern = re.compile(r'\{(?:start|end|label)[}.\[!:]')
         self.export_template_scenes_pattern = re.compile(r'.+')
+        # template text -> whether export is possible with it, parsed fields or None if it's invalid
+        self._export_templates = dict[str, tuple[bool, _TemplateFields | None]]()
+
+        # (importer, path, mtime, size, max frame, fps) -> (start, end, label) of imported scenes, dropped count
+        self._import_cache = OrderedDict[tuple[Any, ...], tuple[list[tuple[int, int, str]], int]]()
+        self._import_cache_lock = Lock()
+
+        self._notches_cache: tuple[SceningList, Notches] | None = None
 
         self.items_combobox.setModel(self.lists)
         self.scening_update_status_label()
@@ -77,8 +113,9 @@ class SceningToolbar(AbstractToolbar):
         self.add_to_list_button.clicked.connect(self.on_add_to_list_clicked)
         self.remove_last_from_list_button.clicked.connect(self.on_remove_last_from_list_clicked)
         self.remove_at_current_frame_button.clicked.connect(self.on_remove_at_current_frame_clicked)
-        self.export_template_lineedit.textChanged.connect(self.check_remove_export_possibility)
+        self.export_template_lineedit.textChanged.connect(self.on_export_template_changed)
         self.export_button.clicked.connect(self.export)
+        self.scening_list_imported.connect(self.on_scening_list_imported)
 
         self.add_shortcuts()
 
@@ -135,6 +172,10 @@ class SceningToolbar(AbstractToolbar):
 
         self.export_button = PushButton('Export', enabled=False)
 
+        self.export_template_timer = Timer(
+            singleShot=True, interval=self.export_template_check_delay, timeout=self.check_export_possibility
+        )
+
         HBoxLayout(self.vlayout, [
             self.items_combobox,
             self.add_list_button,
@@ -165,17 +206,17 @@ class SceningToolbar(AbstractToolbar):
         self.main.statusbar.addPermanentWidget(self.status_label)
 
     def add_shortcuts(self) -> None:
-        for i, key in enumerate(self.num_keys[:-2]):
-            self.add_shortcut(QKeyCombination(Qt.Modifier.SHIFT, key), partial(self.switch_list, i))  # type: ignore
+        for i, key in enumerate(self.num_keys):
+            self.add_shortcut(QKeyCombination(Qt.Modifier.SHIFT, key).toCombined(), partial(self.switch_list, i))
 
         self.add_shortcut(
             QKeyCombination(Qt.Modifier.CTRL, Qt.Key.Key_Space).toCombined(), self.on_toggle_single_frame
         )
         self.add_shortcut(
-            QKeyCombination(Qt.Modifier.CTRL, Qt.Key.Key_Left).toCombined(), self.seek_to_prev_button.click
+            QKeyCombination(Qt.Modifier.CTRL, Qt.Key.Key_Left).toCombined(), self.on_seek_to_prev_clicked
         )
         self.add_shortcut(
-            QKeyCombination(Qt.Modifier.CTRL, Qt.Key.Key_Right).toCombined(), self.seek_to_next_button.click
+            QKeyCombination(Qt.Modifier.CTRL, Qt.Key.Key_Right).toCombined(), self.on_seek_to_next_clicked
         )
         if self.main.settings.azerty_keybinds:
             self.add_shortcut(Qt.Key.Key_A, self.toggle_first_frame_button.click)
@@ -183,10 +224,10 @@ class SceningToolbar(AbstractToolbar):
         else:
             self.add_shortcut(Qt.Key.Key_Q, self.toggle_first_frame_button.click)
             self.add_shortcut(Qt.Key.Key_W, self.toggle_second_frame_button.click)
-        self.add_shortcut(Qt.Key.Key_E, self.add_to_list_button.click)
-        self.add_shortcut(Qt.Key.Key_R, self.remove_last_from_list_button.click)
+        self.add_shortcut(Qt.Key.Key_E, self.on_add_to_list_clicked)
+        self.add_shortcut(Qt.Key.Key_R, self.on_remove_last_from_list_clicked)
         self.add_shortcut(
-            QKeyCombination(Qt.Modifier.SHIFT, Qt.Key.Key_R).toCombined(), self.remove_at_current_frame_button.click
+            QKeyCombination(Qt.Modifier.SHIFT, Qt.Key.Key_R).toCombined(), self.on_remove_at_current_frame_clicked
         )
         self.add_shortcut(
             Qt.Key.Key_B, lambda: self.scening_list_dialog.label_lineedit.setText(
@@ -211,13 +252,16 @@ class SceningToolbar(AbstractToolbar):
         self.scening_list_dialog.on_current_frame_changed(frame, Time(frame))
 
     def get_notches(self) -> Notches:
-        marks = Notches()
-
         if self.current_list is None:
-            return marks
+            return Notches()
+
+        if self._notches_cache is not None and self._notches_cache[0] is self.current_list:
+            return self._notches_cache[1]
 
-        for scene in self.current_list:
-            marks.add(scene, cast(QColor, Qt.GlobalColor.green))
+        marks = Notches()
+        marks.add_many(self.current_list, Qt.GlobalColor.green)
+
+        self._notches_cache = (self.current_list, marks)
 
         return marks
 
@@ -248,7 +292,9 @@ class SceningToolbar(AbstractToolbar):
             self.view_list_button.setEnabled(True)
             new_value.rowsInserted.connect(self._on_list_items_changed)
             new_value.rowsRemoved.connect(self._on_list_items_changed)
+            new_value.rowsMoved.connect(self._on_list_items_changed)
             new_value.dataChanged.connect(self._on_list_items_changed)
+            new_value.modelReset.connect(self._on_list_items_changed)
             self.scening_list_dialog.on_current_list_changed(new_value)
         else:
             self.remove_list_button.setEnabled(False)
@@ -258,15 +304,19 @@ class SceningToolbar(AbstractToolbar):
             try:
                 old_value.rowsInserted.disconnect(self._on_list_items_changed)
                 old_value.rowsRemoved.disconnect(self._on_list_items_changed)
+                old_value.rowsMoved.disconnect(self._on_list_items_changed)
                 old_value.dataChanged.disconnect(self._on_list_items_changed)
+                old_value.modelReset.disconnect(self._on_list_items_changed)
             except (IndexError, TypeError):
                 pass
 
+        self._notches_cache = None
         self.check_add_to_list_possibility()
         self.check_remove_export_possibility()
         self.notches_changed.emit(self)
 
-    def on_list_items_changed(self, parent: QModelIndex, first: int, last: int) -> None:
+    def on_list_items_changed(self, *args: Any) -> None:
+        self._notches_cache = None
         self.notches_changed.emit(self)
 
     def on_remove_list_clicked(self, checked: bool | None = None) -> None:
@@ -286,7 +336,7 @@ class SceningToolbar(AbstractToolbar):
             pass
 
     def on_seek_to_prev_clicked(self, checked: bool | None = None) -> None:
-        if self.current_list is None:
+        if self.current_list is None or not self.seek_to_prev_button.isEnabled():
             return
 
         new_pos = self.current_list.get_prev_frame(self.main.current_output.last_showed_frame)
@@ -295,7 +345,7 @@ class SceningToolbar(AbstractToolbar):
         self.main.switch_frame(new_pos)
 
     def on_seek_to_next_clicked(self, checked: bool | None = None) -> None:
-        if self.current_list is None:
+        if self.current_list is None or not self.seek_to_next_button.isEnabled():
             return
 
         new_pos = self.current_list.get_next_frame(self.main.current_output.last_showed_frame)
@@ -314,6 +364,9 @@ class SceningToolbar(AbstractToolbar):
         self.check_remove_export_possibility()
 
     def on_add_to_list_clicked(self, checked: bool | None = None) -> None:
+        if not self.add_to_list_button.isEnabled():
+            return
+
         self.current_list.add(self.first_frame, self.second_frame, self.label_lineedit.text())  # type: ignore
 
         if self.toggle_first_frame_button.isChecked():
@@ -337,20 +390,16 @@ class SceningToolbar(AbstractToolbar):
         self.check_add_to_list_possibility()
 
     def on_remove_at_current_frame_clicked(self, checked: bool | None = None) -> None:
-        if self.current_list is None:
+        if self.current_list is None or not self.remove_at_current_frame_button.isEnabled():
             return
 
-        curr = self.main.current_output.last_showed_frame
-
-        for scene in self.current_list:
-            if (scene.start == curr or scene.end == curr):
-                self.current_list.remove(scene)
+        self.current_list.remove_at(self.main.current_output.last_showed_frame)
 
         self.remove_at_current_frame_button.clearFocus()
         self.check_remove_export_possibility()
 
     def on_remove_last_from_list_clicked(self, checked: bool | None = None) -> None:
-        if self.current_list is None:
+        if self.current_list is None or not self.remove_last_from_list_button.isEnabled():
             return
 
         self.current_list.remove(self.current_list[-1])
@@ -370,14 +419,14 @@ class SceningToolbar(AbstractToolbar):
 
     def on_toggle_single_frame(self) -> None:
         if self.add_single_frame_button.isEnabled():
-            self.add_single_frame_button.click()
+            self.on_add_single_frame_clicked()
         elif self.remove_at_current_frame_button.isEnabled():
-            self.remove_at_current_frame_button.click()
+            self.on_remove_at_current_frame_clicked()
 
     def on_import_file_clicked(self, checked: bool | None = None) -> None:
-        filter_str = ';;'.join(supported_file_types.keys())
+        # the native picker is a lot faster than Qt's own one in directories with many files
         path_strs, file_type = QFileDialog.getOpenFileNames(
-            self.main, caption='Open chapters file', filter=filter_str
+            self.main, caption='Open chapters file', filter=self.import_filter_str, options=QFileDialog.Option(0)
         )
 
         paths = [Path(path_str) for path_str in path_strs]
@@ -387,63 +436,223 @@ class SceningToolbar(AbstractToolbar):
     @fire_and_forget
     @set_status_label('Importing scening list')
     def import_file(self, import_func: Callable[[Path, SceningList], int], path: Path) -> None:
-        scening_list, scening_list_index = self.lists.add(path.stem)
+        # this runs in a worker thread, so the list is filled while detached from any model or view
+        # and only handed over to the GUI thread once it's complete
+        scening_list = SceningList(path.stem, self.main.current_output.total_frames - 1)
 
-        out_of_range_count = import_func(path, scening_list)
+        out_of_range_count = self._import_file_cached(import_func, path, scening_list)
 
         if out_of_range_count > 0:
             logging.warning(
                 f'Scening import: {out_of_range_count} scenes were out of range of output, so they were dropped.')
         if len(scening_list) == 0:
             logging.warning(f"Scening import: nothing was imported from '{path.name}'.")
-            self.lists.remove(scening_list_index)
-        else:
-            self.current_list_index = scening_list_index
+            return
+
+        scening_list.moveToThread(self.thread())
+        self.scening_list_imported.emit(scening_list)
+
+    def on_scening_list_imported(self, scening_list: SceningList) -> None:
+        self.current_list_index = self.lists.add_list(scening_list)
+
+    def _import_file_cached(
+        self, import_func: Callable[[Path, SceningList], int], path: Path, scening_list: SceningList
+    ) -> int:
+        output = self.main.current_output
+
+        # with timecodes, frame numbers of time based formats depend on the whole timecodes list of the output,
+        # which is too big to key on, so those imports always parse the file again
+        if output.got_timecodes:
+            return import_func(path, scening_list)
+
+        stat = path.stat()
+
+        # frame numbers of time based formats depend on the output's fps otherwise, so it's part of the key too
+        key = (
+            import_func, str(path.resolve()), stat.st_mtime_ns, stat.st_size,
+            int(scening_list.max_value), output.fps_num, output.fps_den
+        )
+
+        with self._import_cache_lock:
+            cached = self._import_cache.get(key)
+            if cached is not None:
+                self._import_cache.move_to_end(key)
+
+        if cached is not None:
+            scenes, out_of_range_count = cached
+
+            scening_list.add_many((Frame(start), Frame(end), label) for start, end, label in scenes)
+
+            return out_of_range_count
+
+        out_of_range_count = import_func(path, scening_list)
+        scenes = [(int(scene.start), int(scene.end), scene.label) for scene in scening_list]
+
+        with self._import_cache_lock:
+            self._import_cache[key] = (scenes, out_of_range_count)
+
+            while len(self._import_cache) > self.import_cache_size:
+                self._import_cache.popitem(last=False)
+
+        return out_of_range_count
 
     def export(self, checked: bool | None = None) -> None:
         if self.current_list is None:
             return
 
-        template = self.export_template_lineedit.text()
-        export_str = str()
+        if not self.current_list:
+            self.main.show_message('Scening list is empty, nothing to export')
+            return
+
+        # a click can land before the debounced check ran, so settle the button state for the current text first
+        if self.export_template_timer.isActive():
+            self.export_template_timer.stop()
+            self.check_export_possibility()
 
-        try:
-            for scene in self.current_list:
-                export_str += template.format(
-                    start=scene.start, end=scene.end, label=scene.label, script_name=self.main.script_path.stem
-                ) + ('\n' if self.settings.export_multiline else '')
-        except KeyError:
+        is_valid, fields = self.get_export_template(self.export_template_lineedit.text())
+
+        if not is_valid or fields is None:
             logging.warning('Scening: export template contains invalid placeholders.')
             self.main.show_message('Export template contains invalid placeholders.')
             return
 
+        separator = '\n' if self.settings.export_multiline else ''
+
+        scenes = self.current_list
+        rows = self.iter_export_rows(scenes, fields, separator)
+
+        progress = None
+        if len(scenes) > self.export_progress_chunk_size:
+            progress = QProgressDialog('Exporting scening list...', 'Cancel', 0, len(scenes), self.main)
+            progress.setWindowModality(Qt.WindowModality.WindowModal)
+
+        buffer = StringIO()
+
+        try:
+            for i, chunk in enumerate(batched(rows, self.export_progress_chunk_size), 1):
+                buffer.writelines(chunk)
+
+                if progress is None:
+                    continue
+
+                # setValue also processes events for modal dialogs, which is what lets cancel clicks through
+                progress.setValue(min(i * self.export_progress_chunk_size, len(scenes)))
+
+                if progress.wasCanceled():
+                    buffer.close()
+                    self.main.show_message('Scening export canceled')
+                    return
+        except (AttributeError, IndexError, KeyError, TypeError, ValueError):
+            logging.warning('Scening: export template could not be applied to the current list.')
+            self.main.show_message('Export template could not be applied to the current list.')
+            return
+        finally:
+            if progress is not None:
+                progress.close()
+
+        export_str = buffer.getvalue()
+
+        # free the buffer before Qt makes its own copy of the text, so big exports don't hold three copies at once
+        buffer.close()
+
         if self.main.clipboard:
-            self.main.clipboard.setText(export_str)
+            mime_data = QMimeData()
+            mime_data.setText(export_str)
+            self.main.clipboard.setMimeData(mime_data)
 
         self.main.show_message('Scening data exported to the clipboard')
 
-    def check_add_to_list_possibility(self) -> None:
-        self.add_to_list_button.setEnabled(False)
+    def iter_export_rows(self, scenes: Iterable[Scene], fields: _TemplateFields, separator: str) -> Iterator[str]:
+        formatter = self.export_formatter
+        values = dict[str, Any](script_name=self.main.script_path.stem)
 
-        if not (self.current_list_index != -1 and (self.first_frame is not None or self.second_frame is not None)):
-            return
+        for scene in scenes:
+            values['start'], values['end'], values['label'] = scene.start, scene.end, scene.label
+            row = list[str]()
+
+            for literal_text, field_name, format_spec, conversion in fields:
+                row.append(literal_text)
+
+                if field_name is None:
+                    continue
+
+                value = values[field_name] if field_name in values else formatter.get_field(
+                    field_name, (), values
+                )[0]
+
+                if conversion is not None:
+                    value = formatter.convert_field(value, conversion)
+
+                if format_spec is None:
+                    format_spec = ''
+                elif '{' in format_spec:
+                    format_spec = formatter.vformat(format_spec, (), values)
+
+                row.append(format(value, format_spec))
 
-        self.add_to_list_button.setEnabled(True)
+            row.append(separator)
+
+            yield ''.join(row)
+
+    def parse_export_template(self, template: str) -> _TemplateFields | None:
+        try:
+            fields = list(self.export_formatter.parse(template))
+        except ValueError:
+            return None
+
+        for _, field_name, _, _ in fields:
+            if field_name is None:
+                continue
+
+            if _FIELD_NAME_ACCESS_RE.split(field_name, maxsplit=1)[0] not in self.export_template_fields:
+                return None
+
+        return fields
+
+    def check_add_to_list_possibility(self) -> None:
+        self.add_to_list_button.setEnabled(
+            self.current_list_index != -1 and (self.first_frame is not None or self.second_frame is not None)
+        )
 
     def check_remove_export_possibility(self, checked: bool | None = None) -> None:
-        is_enabled = self.current_list is not None and len(self.current_list) > 0
-        self.remove_last_from_list_button.setEnabled(is_enabled)
-        self.seek_to_next_button.setEnabled(is_enabled)
-        self.seek_to_prev_button.setEnabled(is_enabled)
+        current_list = self.current_list
+
+        has_scenes = current_list is not None and len(current_list) > 0
+        in_scene = has_scenes and current_list is not None and (
+            self.main.current_output.last_showed_frame in current_list
+        )
 
-        curr = self.main.current_output.last_showed_frame
+        self.remove_last_from_list_button.setEnabled(has_scenes)
+        self.seek_to_next_button.setEnabled(has_scenes)
+        self.seek_to_prev_button.setEnabled(has_scenes)
+        self.add_single_frame_button.setEnabled(not in_scene)
+        self.remove_at_current_frame_button.setEnabled(in_scene)
 
-        is_enabled = self.current_list is not None and curr in self.current_list
-        self.add_single_frame_button.setEnabled(not is_enabled)
-        self.remove_at_current_frame_button.setEnabled(is_enabled)
+        self.check_export_possibility()
 
-        is_enabled = self.export_template_pattern.fullmatch(self.export_template_lineedit.text()) is not None
-        self.export_button.setEnabled(is_enabled)
+    def on_export_template_changed(self, text: str) -> None:
+        # restarting the timer on every keystroke only validates the template once typing pauses
+        self.export_template_timer.start()
+
+    def check_export_possibility(self) -> None:
+        self.export_button.setEnabled(self.is_export_template_valid(self.export_template_lineedit.text()))
+
+    def is_export_template_valid(self, template: str) -> bool:
+        return self.get_export_template(template)[0]
+
+    def get_export_template(self, template: str) -> tuple[bool, _TemplateFields | None]:
+        if template in self._export_templates:
+            return self._export_templates[template]
+
+        if len(self._export_templates) >= self.export_templates_cache_size:
+            del self._export_templates[next(iter(self._export_templates))]
+
+        fields = self.parse_export_template(template)
+        is_valid = fields is not None and self.export_template_pattern.search(template) is not None
+
+        self._export_templates[template] = (is_valid, fields)
+
+        return is_valid, fields
 
     def scening_update_status_label(self) -> None:
         first_frame_text = str(self.first_frame) if self.first_frame is not None else ''
@@ -460,8 +669,15 @@ class SceningToolbar(AbstractToolbar):
     def __setstate__(self, state: dict[str, Any]) -> None:
         try_load(state, 'lists', SceningLists, self.__setattr__)
         try_load(state, 'current_list_index', int, self.current_list_index)
-        try_load(state, 'first_frame', Frame, self.__setattr__, nullable=True)
-        try_load(state, 'second_frame', Frame, self.__setattr__, nullable=True)
+
+        for name in ('first_frame', 'second_frame'):
+            frame = state.get(name)
+
+            if frame is not None and not isinstance(frame, Frame):
+                logging.warning(storage_err_msg(name))
+                frame = None
+
+            setattr(self, name, frame)
 
         if self.first_frame is not None:
             self.toggle_first_frame_button.setChecked(True)
@@ -472,11 +688,14 @@ class SceningToolbar(AbstractToolbar):
         self.scening_update_status_label()
         self.check_add_to_list_possibility()
 
-        try_load(state, 'label', str, self.label_lineedit.setText)
         self.items_combobox.setModel(self.lists)
 
-        try_load(state, 'scening_export_template', str, self.export_template_lineedit.setText)
-        try_load(state, 'always_show_scene_marks', bool, self.always_show_scene_marks_checkbox.setChecked)
+        for name, expected_type, receiver in (
+            ('label', str, self.label_lineedit.setText),
+            ('scening_export_template', str, self.export_template_lineedit.setText),
+            ('always_show_scene_marks', bool, self.always_show_scene_marks_checkbox.setChecked),
+        ):
+            try_load(state, name, expected_type, receiver)
 
         self.status_label.setVisible(self.always_show_scene_marks_checkbox.isChecked())
 